@@ -6,6 +6,10 @@ Navigation commands (tap, swipe, scroll, text, key, button, openurl) automatical
 run `idb ui describe-all` before and after each action to validate UI state and
 provide exact element coordinates.
 
+When the fb-idb Python package is importable, idb operations go over one gRPC
+connection to idb-companion per simulator, kept open for the whole process;
+otherwise each operation shells out to the `idb` CLI.
+
 Requirements:
   pip install fb-idb
   brew install idb-companion
@@ -17,24 +21,64 @@ Run `python ios_sim.py --help` or `python ios_sim.py <command> --help` for detai
 """
 
 import argparse
+import asyncio
+import atexit
+import contextlib
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from typing import NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:  # optional — faster decode/encode of describe-all payloads
+    orjson = None
+
+try:
+    from idb.common.hid import (
+        button_press_to_events, key_press_to_events, swipe_to_events,
+        tap_to_events, text_to_events,
+    )
+    from idb.common.types import HIDButtonType, HIDDelay
+    from idb.grpc.management import ClientManager
+except ImportError:  # fb-idb not importable — shell out to the idb CLI instead
+    ClientManager = None
+else:
+    try:
+        from idb.common.types import AccessibilityInfoOptions
+        _A11Y_QUERY = (None, AccessibilityInfoOptions())
+    except ImportError:  # older fb-idb: accessibility_info(point, nested)
+        _A11Y_QUERY = (None, False)
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def run(cmd: list, check: bool = True, capture: bool = True) -> subprocess.CompletedProcess:
-    result = subprocess.run(cmd, capture_output=capture, text=True)
+@lru_cache(maxsize=None)
+def executable_path(name: str) -> str:
+    """Absolute path of `name` on PATH (or `name` itself if not found), resolved once per process."""
+    return shutil.which(name) or name
+
+
+def run(cmd: list, check: bool = True, capture: bool = True, text: bool = True) -> subprocess.CompletedProcess:
+    """Run `cmd`; with text=False stdout/stderr stay bytes (for output fed straight to a JSON decoder)."""
+    # An absolute executable path and close_fds=False let CPython spawn with posix_spawn()
+    # instead of fork+exec. Descriptors Python opens are non-inheritable (PEP 446),
+    # so the child still only gets stdin/stdout/stderr.
+    argv = [executable_path(cmd[0]), *cmd[1:]]
+    result = subprocess.run(argv, capture_output=capture, text=text, close_fds=False)
     if check and result.returncode != 0:
         print(f"ERROR: {' '.join(cmd)}", file=sys.stderr)
         if result.stderr:
-            print(result.stderr, file=sys.stderr)
+            stderr = result.stderr if text else result.stderr.decode(errors="replace")
+            print(stderr, file=sys.stderr)
         sys.exit(result.returncode)
     return result
 
@@ -43,37 +87,329 @@ def udid_flags(udid: Optional[str]) -> list:
     return ["--udid", udid] if udid else []
 
 
+def json_loads(data):
+    """Decode JSON from str or bytes — orjson when installed, json otherwise."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def write_lines(lines: list) -> None:
+    """Write `lines` to stdout with a single write call instead of one print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def print_json(obj) -> None:
+    """Pretty-print `obj` as JSON (2-space indent) to stdout."""
+    if orjson:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2))
+
+
+# ---------------------------------------------------------------------------
+# idb session (gRPC client, CLI fallback)
+# ---------------------------------------------------------------------------
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_CLIENT_STACK: Optional[contextlib.AsyncExitStack] = None
+_CLIENTS: dict = {}  # connection pool: {udid: idb.grpc.client.Client}
+
+
+def _await(coro):
+    """
+    Run `coro` on the session event loop. idb failures exit like a failed CLI call
+    and drop the connection pool, so a daemon reconnects on its next command.
+    """
+    global _LOOP
+    if _LOOP is None:
+        _LOOP = asyncio.new_event_loop()
+    try:
+        return _LOOP.run_until_complete(coro)
+    except Exception as exc:
+        print(f"ERROR: idb: {exc}", file=sys.stderr)
+        close_clients()
+        sys.exit(1)
+
+
+@atexit.register
+def close_clients() -> None:
+    """Close every pooled companion connection; the next get_client() reconnects."""
+    global _CLIENT_STACK
+    if _CLIENT_STACK is not None:
+        with contextlib.suppress(Exception):
+            _LOOP.run_until_complete(_CLIENT_STACK.aclose())
+    _CLIENT_STACK = None
+    _CLIENTS.clear()
+
+
+async def connect(udid: Optional[str]):
+    """
+    Return the idb gRPC client for `udid`, connecting to (or spawning) its companion
+    on first use and reusing it afterwards. Returns None when fb-idb is unavailable.
+    """
+    global _CLIENT_STACK
+    if ClientManager is None:
+        return None
+    client = _CLIENTS.get(udid)
+    if client is None:
+        if _CLIENT_STACK is None:
+            _CLIENT_STACK = contextlib.AsyncExitStack()
+        manager = ClientManager(companion_path=shutil.which("idb_companion"))
+        client = await _CLIENT_STACK.enter_async_context(manager.from_udid(udid))
+        _CLIENTS[udid] = client
+    return client
+
+
+def get_client(udid: Optional[str]):
+    """Blocking form of connect(); a connection failure exits like a failed idb call."""
+    if ClientManager is None:
+        return None
+    client = _CLIENTS.get(udid)
+    return client if client is not None else _await(connect(udid))
+
+
+def idb(udid: Optional[str], cli_args: list, rpc=None):
+    """
+    Run one idb operation against `udid`.
+    `rpc` maps a gRPC client to the equivalent coroutine; when it is given and the
+    session is available it is awaited, otherwise `idb <cli_args>` is run.
+    """
+    client = get_client(udid) if rpc is not None else None
+    if client is not None:
+        return _await(rpc(client))
+    return run(["idb", *cli_args] + udid_flags(udid))
+
+
+async def idb_async(udid: Optional[str], cli_args: list, rpc=None):
+    """
+    Coroutine form of idb() for fanning out across simulators on the session loop.
+    Connects the gRPC client on first use; CLI output is returned as bytes.
+    """
+    client = await connect(udid) if rpc is not None else None
+    if client is not None:
+        return await rpc(client)
+    proc = await asyncio.create_subprocess_exec(
+        executable_path("idb"), *cli_args, *udid_flags(udid),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=False,  # posix_spawn, see run()
+    )
+    out, err = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"idb {' '.join(cli_args)}: {err.decode(errors='replace').strip()}")
+    return out
+
+
+def fan_out(udids: list, coro_fn) -> list:
+    """
+    Run `coro_fn(udid)` for every UDID concurrently and return their results in order.
+    A failing simulator — including one whose idb connection fails — yields its
+    exception instead of aborting the others.
+    """
+    async def gather():
+        return await asyncio.gather(*(coro_fn(u) for u in udids), return_exceptions=True)
+
+    return _await(gather())
+
+
 # ---------------------------------------------------------------------------
 # describe-all helpers
 # ---------------------------------------------------------------------------
 
-def describe_all(udid: Optional[str]) -> list:
-    """Return flat JSON list of all UI accessibility elements on screen."""
-    cmd = ["idb", "ui", "describe-all", "--json"] + udid_flags(udid)
-    result = run(cmd)
-    return json.loads(result.stdout)
+class UIColumns(NamedTuple):
+    """Per-element display fields of a snapshot, one list per field, aligned with its elements."""
+    texts: list        # AXLabel or title or AXValue or ""
+    roles: list        # type or role or "?"
+    centers: list      # (cx, cy) of the frame
+    interactive: list  # enabled and role in INTERACTIVE_ROLES
+
+
+class Snapshot(NamedTuple):
+    taken: float       # time.monotonic()
+    elements: list
+    index: tuple       # build_label_index()
+    columns: UIColumns
+
+
+# Most recent describe-all snapshot per UDID: {udid: Snapshot}
+_UI_CACHE: dict = {}
+
+# A snapshot younger than this (seconds) is reused as the PRE state of the next action.
+PRE_MAX_AGE = 0.5
+
+# The element fields the summary/find/tap helpers read; everything else idb reports is dropped.
+ELEMENT_FIELDS = ("AXLabel", "title", "AXValue", "role", "type", "enabled", "frame")
+
+INTERACTIVE_ROLES = frozenset({
+    "AXButton", "AXTextField", "AXSecureTextField", "AXTextArea",
+    "AXPopUpButton", "AXMenuItem", "AXCell", "AXLink", "AXSwitch",
+    "AXSegmentedControl", "AXSlider", "AXCheckBox",
+})
+
+
+def describe_payload(udid: Optional[str]) -> str:
+    """Return the raw `idb ui describe-all --json` output (str over gRPC, bytes from the CLI)."""
+    client = get_client(udid)
+    if client is not None:
+        return _await(client.accessibility_info(*_A11Y_QUERY)).json
+    return run(["idb", "ui", "describe-all", "--json"] + udid_flags(udid), text=False).stdout
+
+
+def describe_all(udid: Optional[str], max_age: float = 0.0) -> list:
+    """
+    Return flat JSON list of all UI accessibility elements on screen, each trimmed
+    to ELEMENT_FIELDS. A cached snapshot younger than `max_age` seconds is returned
+    without calling idb.
+    """
+    elements = cached_elements(udid, max_age)
+    if elements is None:
+        elements = store_snapshot(udid, describe_payload(udid))
+    return elements
+
+
+def cached_elements(udid: Optional[str], max_age: float) -> Optional[list]:
+    """Return the cached snapshot for `udid` if it is younger than `max_age` seconds."""
+    cached = _UI_CACHE.get(udid)
+    if cached and time.monotonic() - cached.taken < max_age:
+        return cached.elements
+    return None
+
+
+async def describe_all_async(udid: Optional[str]) -> list:
+    """Coroutine form of describe_all() (always fresh) for fan_out()."""
+    payload = await idb_async(
+        udid, ["ui", "describe-all", "--json"],
+        lambda c: c.accessibility_info(*_A11Y_QUERY),
+    )
+    return store_snapshot(udid, getattr(payload, "json", payload))
+
+
+def store_snapshot(udid: Optional[str], payload) -> list:
+    """Decode a describe-all payload, trim elements to ELEMENT_FIELDS and cache the result."""
+    return store_elements(udid, json_loads(payload))
+
+
+def store_elements(udid: Optional[str], decoded: list) -> list:
+    """Trim already-decoded describe-all elements to ELEMENT_FIELDS and cache them as a Snapshot."""
+    elements = [
+        {k: e[k] for k in ELEMENT_FIELDS if k in e}
+        for e in decoded
+    ]
+    _UI_CACHE[udid] = Snapshot(
+        time.monotonic(), elements, build_label_index(elements), build_columns(elements),
+    )
+    return elements
+
+
+def invalidate_ui_cache(udid: Optional[str]) -> None:
+    """Drop the cached snapshot for `udid` — call after anything that changes the screen."""
+    _UI_CACHE.pop(udid, None)
+
+
+# Match ranking for find_element(): an exact match on any field beats a prefix match,
+# which beats a substring match; ties go to the element earliest in the tree.
+EXACT_SCORES = {"AXLabel": 100, "title": 90, "AXValue": 80}
+PREFIX_SCORE = 50
+CONTAINS_SCORE = 25
+
+
+def build_label_index(elements: list) -> tuple:
+    """
+    Index elements by lowercased AXLabel / title / AXValue.
+    Returns (exact, labels): `exact` maps each text to its best exact match (highest
+    EXACT_SCORES field, then tree order), `labels` lists (text, element) pairs in tree
+    order for prefix/substring search.
+    """
+    exact = {}
+    best = {}
+    labels = []
+    for e in elements:
+        for key, score in EXACT_SCORES.items():
+            text = e.get(key)
+            if text:
+                text = text.lower()
+                if score > best.get(text, 0):
+                    best[text] = score
+                    exact[text] = e
+                labels.append((text, e))
+    return exact, labels
+
+
+def build_columns(elements: list) -> UIColumns:
+    """Extract the display fields of every element into UIColumns in one pass."""
+    texts, roles, centers, interactive = [], [], [], []
+    for e in elements:
+        texts.append(e.get("AXLabel") or e.get("title") or e.get("AXValue") or "")
+        role = e.get("role")
+        roles.append(e.get("type") or role or "?")
+        frame = e.get("frame") or {}
+        centers.append((
+            frame.get("x", 0) + frame.get("width", 0) / 2,
+            frame.get("y", 0) + frame.get("height", 0) / 2,
+        ))
+        interactive.append(role in INTERACTIVE_ROLES and bool(e.get("enabled", True)))
+    return UIColumns(texts, roles, centers, interactive)
+
+
+def cached_snapshot(elements: list) -> Optional[Snapshot]:
+    """Return the cached Snapshot that `elements` came from, if any."""
+    for snapshot in _UI_CACHE.values():
+        if snapshot.elements is elements:
+            return snapshot
+    return None
+
+
+def label_index(elements: list) -> tuple:
+    """Return the label index for `elements`, reusing the one built with its describe-all snapshot."""
+    snapshot = cached_snapshot(elements)
+    return snapshot.index if snapshot else build_label_index(elements)
+
+
+def ui_columns(elements: list) -> UIColumns:
+    """Return UIColumns for `elements`, reusing the ones built with its describe-all snapshot."""
+    snapshot = cached_snapshot(elements)
+    return snapshot.columns if snapshot else build_columns(elements)
 
 
 def find_element(elements: list, query: str) -> Optional[dict]:
     """
     Find a UI element by label, title, or value (case-insensitive).
-    Tries exact match first, then partial match.
-    """
-    q = query.lower()
-    for exact in (True, False):
-        for e in elements:
-            candidates = [
-                (e.get("AXLabel") or "").lower(),
-                (e.get("title") or "").lower(),
-                (e.get("AXValue") or "").lower(),
-            ]
-            if exact:
-                if q in candidates:
-                    return e
-            else:
-                if any(q in c for c in candidates if c):
-                    return e
-    return None
+    Returns the best-ranked match (see EXACT_SCORES / PREFIX_SCORE / CONTAINS_SCORE).
+    """
+    return find_elements(elements, [query])[query]
+
+
+def find_elements(elements: list, queries: list) -> dict:
+    """
+    Resolve several queries with find_element() ranking in a single scan: exact
+    matches come from the label index, the rest share one pass over the labels,
+    stopping once every query has a prefix match. Returns {query: element or None}.
+    """
+    exact, labels = label_index(elements)
+    found = dict.fromkeys(queries)
+    pending = {}  # lowercased query -> [best score so far, element, original queries]
+    for query in queries:
+        q = query.lower()
+        if q in exact:
+            found[query] = exact[q]
+        elif q in pending:
+            pending[q][2].append(query)
+        else:
+            pending[q] = [0, None, [query]]
+    unresolved = set(pending)
+    for text, e in labels:
+        if not unresolved:
+            break
+        for q in [q for q in unresolved if q in text]:
+            match = pending[q]
+            if text.startswith(q):
+                match[0], match[1] = PREFIX_SCORE, e
+                unresolved.discard(q)  # nothing but an exact match ranks higher
+            elif match[0] < CONTAINS_SCORE:
+                match[0], match[1] = CONTAINS_SCORE, e
+    for _, e, originals in pending.values():
+        for query in originals:
+            found[query] = e
+    return found
 
 
 def element_center(element: dict) -> tuple:
@@ -87,56 +423,105 @@ def element_center(element: dict) -> tuple:
 def print_ui_summary(elements: list, label: str = "UI State") -> None:
     """Print a concise, human-readable accessibility summary."""
     sep = "─" * 56
-    print(f"\n{sep}")
-    print(f"  {label}")
-    print(sep)
+    out = ["", sep, f"  {label}", sep]
 
     app = next((e for e in elements if e.get("role") == "AXApplication"), None)
     if app:
-        print(f"  App    : {app.get('AXLabel', '?')}")
-    print(f"  Elements: {len(elements)}")
-
-    INTERACTIVE = {
-        "AXButton", "AXTextField", "AXSecureTextField", "AXTextArea",
-        "AXPopUpButton", "AXMenuItem", "AXCell", "AXLink", "AXSwitch",
-        "AXSegmentedControl", "AXSlider", "AXCheckBox",
-    }
-    interactive = [
-        e for e in elements
-        if e.get("role") in INTERACTIVE and e.get("enabled", True)
-    ]
+        out.append(f"  App    : {app.get('AXLabel', '?')}")
+    out.append(f"  Elements: {len(elements)}")
+
+    cols = ui_columns(elements)
+    interactive = [i for i, flag in enumerate(cols.interactive) if flag]
     if interactive:
-        print(f"\n  Interactive ({len(interactive)}):")
-        for e in interactive[:15]:
-            text = (
-                e.get("AXLabel")
-                or e.get("title")
-                or e.get("AXValue")
-                or ""
-            )
-            role = e.get("type") or e.get("role") or "?"
-            cx, cy = element_center(e)
-            print(f"    [{role:<22s}] '{text}'  →  tap({cx:.0f}, {cy:.0f})")
+        out.append(f"\n  Interactive ({len(interactive)}):")
+        for i in islice(interactive, 15):
+            cx, cy = cols.centers[i]
+            out.append(f"    [{cols.roles[i]:<22s}] '{cols.texts[i]}'  →  tap({cx:.0f}, {cy:.0f})")
         if len(interactive) > 15:
-            print(f"    … and {len(interactive) - 15} more")
-    print(sep)
+            out.append(f"    … and {len(interactive) - 15} more")
+    out.append(sep)
+    write_lines(out)
 
 
-def with_ui_hooks(udid: Optional[str], action_name: str, action_fn) -> tuple:
+# Post-action polling: re-run describe-all every SETTLE_INTERVAL seconds until the
+# UI has changed and held still, or give up after SETTLE_TIMEOUT seconds.
+SETTLE_INTERVAL = 0.05
+SETTLE_TIMEOUT = 1.0
+
+
+def ui_signature(elements: list) -> int:
+    """Hash of each element's label, value and frame — equal signatures mean an unchanged screen."""
+    return hash(tuple(
+        (e.get("AXLabel"), e.get("AXValue"), tuple((e.get("frame") or {}).values()))
+        for e in elements
+    ))
+
+
+def wait_for_settle(udid: Optional[str], pre: Optional[list]) -> list:
+    """
+    Poll describe-all after an action until the screen differs from `pre` and is
+    identical on two consecutive polls (the transition finished), or until
+    SETTLE_TIMEOUT passes. Without `pre` there is nothing to tell a finished
+    transition from one that has not started, so wait SETTLE_TIMEOUT and take a
+    single snapshot. Intermediate polls are only decoded and hashed; the returned
+    one is cached as a full Snapshot.
+    """
+    if pre is None:
+        time.sleep(SETTLE_TIMEOUT)
+        return describe_all(udid)
+    pre_sig = ui_signature(pre)
+    last_sig = None
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    while True:
+        decoded = json_loads(describe_payload(udid))
+        sig = ui_signature(decoded)
+        if (sig != pre_sig and sig == last_sig) or time.monotonic() >= deadline:
+            return store_elements(udid, decoded)
+        last_sig = sig
+        time.sleep(SETTLE_INTERVAL)
+
+
+def with_ui_hooks(udid: Optional[str], action_name: str, action_fn, pre: Optional[list] = None,
+                  capture_pre: bool = True) -> tuple:
     """
     Execute a navigation action wrapped with pre/post describe-all hooks.
+    `action_fn` performs the action and may return a message to print.
+    Callers that already captured (and printed) the PRE state pass it as `pre`;
+    otherwise a fresh-enough cached snapshot is reused before querying idb.
+    With capture_pre=False (--no-pre) the PRE hook is skipped and pre_elements is None;
+    the last cached snapshot of any age (usually the previous POST) still serves
+    as the settle baseline.
     Returns (pre_elements, post_elements).
     """
-    print(f"\n▶ {action_name} — capturing PRE-action UI state …")
-    pre = describe_all(udid)
-    print_ui_summary(pre, f"PRE  | {action_name}")
-
-    action_fn()
-
-    time.sleep(1.0)  # wait for navigation transition animation to finish
+    show_pre = pre is None and capture_pre
+    payload = None
+    baseline = None
+    if pre is None and not capture_pre:
+        cached = _UI_CACHE.get(udid)
+        baseline = cached.elements if cached else None
+    if show_pre:
+        print(f"\n▶ {action_name} — capturing PRE-action UI state …")
+        pre = cached_elements(udid, PRE_MAX_AGE)
+        if pre is None:
+            payload = describe_payload(udid)  # read before the action is sent
+
+    if payload is None:
+        if show_pre:
+            print_ui_summary(pre, f"PRE  | {action_name}")
+        message = action_fn()
+    else:
+        # Decode and summarize PRE while idb carries out the action.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            action = pool.submit(action_fn)
+            pre = store_snapshot(udid, payload)
+            print_ui_summary(pre, f"PRE  | {action_name}")
+            message = action.result()
+    invalidate_ui_cache(udid)
+    if message:
+        print(message)
 
     print(f"\n▶ {action_name} — capturing POST-action UI state …")
-    post = describe_all(udid)
+    post = wait_for_settle(udid, pre if pre is not None else baseline)
     print_ui_summary(post, f"POST | {action_name}")
 
     return pre, post
@@ -148,8 +533,8 @@ def with_ui_hooks(udid: Optional[str], action_name: str, action_fn) -> tuple:
 
 def cmd_list(_args) -> None:
     """List available iOS simulators."""
-    result = run(["xcrun", "simctl", "list", "devices", "--json"])
-    data = json.loads(result.stdout)
+    result = run(["xcrun", "simctl", "list", "devices", "--json"], text=False)
+    data = json_loads(result.stdout)
     print(f"\n{'UDID':<38}  {'State':<10}  {'Name'}")
     print("─" * 78)
     for runtime, devices in data["devices"].items():
@@ -164,10 +549,22 @@ def cmd_list(_args) -> None:
             print(f"{d['udid']}  {state:<10}  {d['name']}  [{rt_label}]")
 
 
+def booted_udids() -> list:
+    """Return the UDIDs of all booted simulators."""
+    data = json_loads(run(["xcrun", "simctl", "list", "devices", "booted", "--json"], text=False).stdout)
+    return [
+        d["udid"]
+        for devices in data["devices"].values()
+        for d in devices
+        if d.get("state") == "Booted"
+    ]
+
+
 def cmd_boot(args) -> None:
     """Boot a simulator."""
     print(f"Booting {args.udid} …")
     run(["xcrun", "simctl", "boot", args.udid])
+    invalidate_ui_cache(args.udid)
     print("Done.")
 
 
@@ -175,6 +572,7 @@ def cmd_shutdown(args) -> None:
     """Shutdown a simulator."""
     print(f"Shutting down {args.udid} …")
     run(["xcrun", "simctl", "shutdown", args.udid])
+    invalidate_ui_cache(args.udid)
     print("Done.")
 
 
@@ -212,9 +610,9 @@ def cmd_build(args) -> None:
 
     app_dir = os.path.join(derived, "Build", "Products", f"{args.configuration}-iphonesimulator")
     print(f"\nBuild products: {app_dir}")
-    apps = [f for f in os.listdir(app_dir) if f.endswith(".app")] if os.path.isdir(app_dir) else []
+    apps = [e.path for e in os.scandir(app_dir) if e.name.endswith(".app")] if os.path.isdir(app_dir) else []
     for a in apps:
-        print(f"  → {os.path.join(app_dir, a)}")
+        print(f"  → {a}")
 
 
 # ---------------------------------------------------------------------------
@@ -226,6 +624,7 @@ def cmd_install(args) -> None:
     cmd = ["idb", "install", args.app_path] + udid_flags(args.udid)
     print(f"Installing {args.app_path} …")
     run(cmd, capture=False)
+    invalidate_ui_cache(args.udid)
     print("Installed.")
 
 
@@ -234,6 +633,7 @@ def cmd_launch(args) -> None:
     cmd = ["idb", "launch", args.bundle_id] + udid_flags(args.udid)
     print(f"Launching {args.bundle_id} …")
     run(cmd)
+    invalidate_ui_cache(args.udid)
     print(f"Launched {args.bundle_id}.")
     time.sleep(1.5)
     # Show initial UI state
@@ -241,20 +641,63 @@ def cmd_launch(args) -> None:
     print_ui_summary(elements, f"LAUNCHED | {args.bundle_id}")
 
 
+def target_udids(args) -> list:
+    """UDIDs given with repeated --udid, or every booted simulator when none are given."""
+    udids = args.udid or booted_udids()
+    if not udids:
+        print("ERROR: No booted simulators", file=sys.stderr)
+        sys.exit(1)
+    return udids
+
+
+def report_fan_out(udids: list, results: list, label: str) -> None:
+    """Print each simulator's UI snapshot (or error) from fan_out(); exit 1 if any failed."""
+    failed = 0
+    for udid, result in zip(udids, results):
+        if isinstance(result, BaseException):
+            failed += 1
+            print(f"ERROR: {udid}: {result}", file=sys.stderr)
+        else:
+            print_ui_summary(result, f"{label} | {udid}")
+    if failed:
+        sys.exit(1)
+
+
+def cmd_launch_all(args) -> None:
+    """Launch an app on several simulators in parallel and show each initial UI state."""
+    udids = target_udids(args)
+
+    async def launch_one(udid):
+        await idb_async(udid, ["launch", args.bundle_id])
+        invalidate_ui_cache(udid)
+        await asyncio.sleep(1.5)
+        return await describe_all_async(udid)
+
+    print(f"Launching {args.bundle_id} on {len(udids)} simulator(s) …")
+    report_fan_out(udids, fan_out(udids, launch_one), f"LAUNCHED | {args.bundle_id}")
+
+
+def cmd_describe_all_sims(args) -> None:
+    """Capture the UI state of several simulators in parallel."""
+    udids = target_udids(args)
+    report_fan_out(udids, fan_out(udids, describe_all_async), "UI State")
+
+
 def cmd_terminate(args) -> None:
     """Terminate a running app."""
     cmd = ["idb", "terminate", args.bundle_id] + udid_flags(args.udid)
     print(f"Terminating {args.bundle_id} …")
     run(cmd)
+    invalidate_ui_cache(args.udid)
     print(f"Terminated {args.bundle_id}.")
 
 
 def cmd_list_apps(args) -> None:
     """List installed apps."""
     cmd = ["idb", "list-apps", "--json", "--fetch-process-state"] + udid_flags(args.udid)
-    result = run(cmd)
+    result = run(cmd, text=False)
     # idb outputs one JSON object per line (NDJSON), not a JSON array
-    apps = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    apps = [json_loads(line) for line in result.stdout.splitlines() if line.strip()]
     print(f"\n{'Bundle ID':<50}  {'State':<12}  Name")
     print("─" * 80)
     for app in apps:
@@ -268,16 +711,36 @@ def cmd_list_apps(args) -> None:
 # Navigation commands — all wrapped with describe-all hooks
 # ---------------------------------------------------------------------------
 
+NAMED_KEYS = {
+    "enter": 40, "return": 40,
+    "backspace": 42, "delete": 42,
+    "tab": 43,
+    "space": 44,
+    "escape": 41,
+    "right": 79, "left": 80, "down": 81, "up": 82,
+    "home": 74, "end": 77,
+    "f1": 58, "f2": 59, "f3": 60, "f4": 61,
+}
+
+BUTTONS = frozenset({"APPLE_PAY", "HOME", "LOCK", "SIDE_BUTTON", "SIRI"})
+
+
+def keycode(key: str) -> Optional[str]:
+    """Resolve a key name (see NAMED_KEYS) or numeric HID code to the code string; None if unknown."""
+    code = str(NAMED_KEYS.get(key.lower(), key))
+    return code if code.isascii() and code.isdigit() else None
+
+
 def cmd_tap(args) -> None:
     """Tap at (x, y) with pre/post UI validation."""
     def action():
-        cmd = ["idb", "ui", "tap", str(int(args.x)), str(int(args.y))] + udid_flags(args.udid)
+        cli = ["ui", "tap", str(int(args.x)), str(int(args.y))]
         if args.duration:
-            cmd += ["--duration", str(args.duration)]
-        run(cmd)
-        print(f"Tapped ({int(args.x)}, {int(args.y)})")
+            cli += ["--duration", str(args.duration)]
+        idb(args.udid, cli, lambda c: c.tap(int(args.x), int(args.y), args.duration))
+        return f"Tapped ({int(args.x)}, {int(args.y)})"
 
-    with_ui_hooks(args.udid, f"tap({args.x}, {args.y})", action)
+    with_ui_hooks(args.udid, f"tap({args.x}, {args.y})", action, capture_pre=args.pre)
 
 
 def cmd_tap_element(args) -> None:
@@ -286,17 +749,17 @@ def cmd_tap_element(args) -> None:
     This is the preferred way to tap since it uses live coordinates.
     """
     print(f"\n▶ tap-element '{args.label}' — running describe-all to find target …")
-    elements = describe_all(args.udid)
+    elements = describe_all(args.udid, max_age=PRE_MAX_AGE)
     print_ui_summary(elements, f"PRE  | tap-element '{args.label}'")
 
     elem = find_element(elements, args.label)
     if elem is None:
         print(f"ERROR: No element found matching '{args.label}'", file=sys.stderr)
         print("Available labels:")
-        for e in elements:
-            lbl = e.get("AXLabel") or e.get("title") or e.get("AXValue") or ""
+        cols = ui_columns(elements)
+        for lbl, role in zip(cols.texts, cols.roles):
             if lbl:
-                print(f"  [{e.get('type', e.get('role'))}] '{lbl}'")
+                print(f"  [{role}] '{lbl}'")
         sys.exit(1)
 
     cx, cy = element_center(elem)
@@ -304,30 +767,40 @@ def cmd_tap_element(args) -> None:
     lbl = elem.get("AXLabel") or elem.get("title") or ""
     print(f"\nFound: [{role}] '{lbl}'  →  tapping ({cx:.0f}, {cy:.0f})")
 
-    cmd = ["idb", "ui", "tap", str(int(cx)), str(int(cy))] + udid_flags(args.udid)
-    run(cmd)
+    def action():
+        idb(args.udid, ["ui", "tap", str(int(cx)), str(int(cy))],
+            lambda c: c.tap(int(cx), int(cy)))
 
-    time.sleep(1.0)  # wait for navigation transition animation to finish
-    post = describe_all(args.udid)
-    print_ui_summary(post, f"POST | tap-element '{args.label}'")
+    with_ui_hooks(args.udid, f"tap-element '{args.label}'", action, pre=elements)
 
 
 def cmd_swipe(args) -> None:
     """Swipe from (x1,y1) to (x2,y2) with pre/post UI validation."""
     def action():
-        cmd = [
-            "idb", "ui", "swipe",
+        cli = [
+            "ui", "swipe",
             str(args.x1), str(args.y1),
             str(args.x2), str(args.y2),
-        ] + udid_flags(args.udid)
+        ]
         if args.duration:
-            cmd += ["--duration", str(args.duration)]
+            cli += ["--duration", str(args.duration)]
         if args.delta:
-            cmd += ["--delta", str(args.delta)]
-        run(cmd)
-        print(f"Swiped ({args.x1},{args.y1}) → ({args.x2},{args.y2})")
+            cli += ["--delta", str(args.delta)]
+        idb(args.udid, cli, lambda c: c.swipe(
+            (args.x1, args.y1), (args.x2, args.y2), args.duration, args.delta))
+        return f"Swiped ({args.x1},{args.y1}) → ({args.x2},{args.y2})"
 
-    with_ui_hooks(args.udid, f"swipe({args.x1},{args.y1}→{args.x2},{args.y2})", action)
+    with_ui_hooks(args.udid, f"swipe({args.x1},{args.y1}→{args.x2},{args.y2})", action, capture_pre=args.pre)
+
+
+# Swipe start/end offsets from the screen center, in units of half the scroll distance:
+# direction → (x1, y1, x2, y2)
+SCROLL_VECTORS = {
+    "up":    (0, -1, 0, 1),   # finger moves down
+    "down":  (0, 1, 0, -1),   # finger moves up
+    "left":  (1, 0, -1, 0),   # finger moves left
+    "right": (-1, 0, 1, 0),   # finger moves right
+}
 
 
 def cmd_scroll(args) -> None:
@@ -341,7 +814,7 @@ def cmd_scroll(args) -> None:
       right → finger swipes left  (reveals content to the right)
     """
     # Probe screen dimensions from describe-all
-    elements = describe_all(args.udid)
+    elements = describe_all(args.udid, max_age=PRE_MAX_AGE)
     app = next((e for e in elements if e.get("role") == "AXApplication"), None)
     if app:
         frame = app.get("frame", {})
@@ -351,92 +824,154 @@ def cmd_scroll(args) -> None:
         w, h = 390, 844
 
     cx, cy = w / 2, h / 2
-    dist = args.distance  # swipe distance in points
+    half = args.distance / 2  # swipe distance in points, split around the center
 
-    direction_map = {
-        "down":  (cx, cy + dist / 2, cx, cy - dist / 2),   # finger moves up
-        "up":    (cx, cy - dist / 2, cx, cy + dist / 2),   # finger moves down
-        "left":  (cx + dist / 2, cy, cx - dist / 2, cy),   # finger moves left
-        "right": (cx - dist / 2, cy, cx + dist / 2, cy),   # finger moves right
-    }
-    x1, y1, x2, y2 = direction_map[args.direction]
-    x1, y1, x2, y2 = max(0, x1), max(0, y1), max(0, x2), max(0, y2)
+    sx1, sy1, sx2, sy2 = SCROLL_VECTORS[args.direction]
+    x1, y1 = max(0, cx + sx1 * half), max(0, cy + sy1 * half)
+    x2, y2 = max(0, cx + sx2 * half), max(0, cy + sy2 * half)
 
     def action():
-        cmd = [
-            "idb", "ui", "swipe",
+        cli = [
+            "ui", "swipe",
             str(int(x1)), str(int(y1)),
             str(int(x2)), str(int(y2)),
             "--duration", str(args.speed),
-        ] + udid_flags(args.udid)
-        run(cmd)
-        print(f"Scrolled {args.direction}: swipe ({int(x1)},{int(y1)}) → ({int(x2)},{int(y2)})")
+        ]
+        idb(args.udid, cli, lambda c: c.swipe(
+            (int(x1), int(y1)), (int(x2), int(y2)), args.speed))
+        return f"Scrolled {args.direction}: swipe ({int(x1)},{int(y1)}) → ({int(x2)},{int(y2)})"
 
     print_ui_summary(elements, f"PRE  | scroll-{args.direction}")
-    action()
-    time.sleep(1.0)  # wait for navigation transition animation to finish
-    post = describe_all(args.udid)
-    print_ui_summary(post, f"POST | scroll-{args.direction}")
+    with_ui_hooks(args.udid, f"scroll-{args.direction}", action, pre=elements)
 
 
 def cmd_text(args) -> None:
     """Type text with pre/post UI validation."""
     def action():
-        cmd = ["idb", "ui", "text", args.text] + udid_flags(args.udid)
-        run(cmd)
-        print(f"Typed: {args.text!r}")
+        idb(args.udid, ["ui", "text", args.text], lambda c: c.text(args.text))
+        return f"Typed: {args.text!r}"
 
-    with_ui_hooks(args.udid, f"text({args.text!r})", action)
+    with_ui_hooks(args.udid, f"text({args.text!r})", action, capture_pre=args.pre)
 
 
 def cmd_key(args) -> None:
     """Press a key by keycode with pre/post UI validation."""
-    NAMED_KEYS = {
-        "enter": 40, "return": 40,
-        "backspace": 42, "delete": 42,
-        "tab": 43,
-        "space": 44,
-        "escape": 41,
-        "right": 79, "left": 80, "down": 81, "up": 82,
-        "home": 74, "end": 77,
-        "f1": 58, "f2": 59, "f3": 60, "f4": 61,
-    }
-    key_val = args.key
-    if isinstance(key_val, str) and not key_val.isdigit():
-        key_val = str(NAMED_KEYS.get(key_val.lower(), key_val))
+    key_val = keycode(args.key)
+    if key_val is None:
+        print(f"ERROR: Unknown key '{args.key}'. Use a HID keycode or one of: "
+              f"{', '.join(NAMED_KEYS)}", file=sys.stderr)
+        sys.exit(1)
 
     def action():
-        cmd = ["idb", "ui", "key", str(key_val)] + udid_flags(args.udid)
-        run(cmd)
-        print(f"Key press: {args.key} (code {key_val})")
+        idb(args.udid, ["ui", "key", key_val], lambda c: c.key(int(key_val)))
+        return f"Key press: {args.key} (code {key_val})"
 
-    with_ui_hooks(args.udid, f"key({args.key})", action)
+    with_ui_hooks(args.udid, f"key({args.key})", action, capture_pre=args.pre)
 
 
 def cmd_button(args) -> None:
     """Press a hardware button (HOME, LOCK, SIRI, SIDE_BUTTON, APPLE_PAY)."""
-    valid = {"APPLE_PAY", "HOME", "LOCK", "SIDE_BUTTON", "SIRI"}
-    button = args.button.upper()
-    if button not in valid:
-        print(f"ERROR: Invalid button '{button}'. Choose from: {valid}", file=sys.stderr)
-        sys.exit(1)
+    button = args.button  # validated and upper-cased by the parser
 
     def action():
-        cmd = ["idb", "ui", "button", button] + udid_flags(args.udid)
-        run(cmd)
-        print(f"Button: {button}")
+        idb(args.udid, ["ui", "button", button], lambda c: c.button(HIDButtonType[button]))
+        return f"Button: {button}"
 
-    with_ui_hooks(args.udid, f"button({button})", action)
+    with_ui_hooks(args.udid, f"button({button})", action, capture_pre=args.pre)
 
 
 def cmd_openurl(args) -> None:
     """Open a URL in the simulator with pre/post UI validation."""
     def action():
-        cmd = ["idb", "open", args.url] + udid_flags(args.udid)
-        run(cmd)
-        print(f"Opened URL: {args.url}")
+        idb(args.udid, ["open", args.url], lambda c: c.open_url(args.url))
+        return f"Opened URL: {args.url}"
+
+    with_ui_hooks(args.udid, f"openurl({args.url})", action, capture_pre=args.pre)
 
-    with_ui_hooks(args.udid, f"openurl({args.url})", action)
+
+def script_step(udid: Optional[str], step: dict) -> tuple:
+    """
+    Translate one `script` step into (description, CLI fallback callable, HID events).
+    Events are None when fb-idb is unavailable. Raises ValueError/KeyError on a malformed step.
+    """
+    op = step.get("op")
+    hid = ClientManager is not None
+    if op == "tap":
+        x, y, duration = int(step["x"]), int(step["y"]), step.get("duration")
+        cli = ["ui", "tap", str(x), str(y)] + (["--duration", str(duration)] if duration else [])
+        return f"tap({x}, {y})", partial(idb, udid, cli), tap_to_events(x, y, duration) if hid else None
+    if op == "swipe":
+        x1, y1, x2, y2 = (int(step[k]) for k in ("x1", "y1", "x2", "y2"))
+        duration, delta = step.get("duration"), step.get("delta")
+        cli = ["ui", "swipe", str(x1), str(y1), str(x2), str(y2)]
+        if duration:
+            cli += ["--duration", str(duration)]
+        if delta:
+            cli += ["--delta", str(delta)]
+        events = swipe_to_events((x1, y1), (x2, y2), duration, delta) if hid else None
+        return f"swipe({x1},{y1}→{x2},{y2})", partial(idb, udid, cli), events
+    if op == "text":
+        text = str(step["text"])
+        events = text_to_events(text) if hid else None
+        return f"text({text!r})", partial(idb, udid, ["ui", "text", text]), events
+    if op == "key":
+        code = keycode(str(step["key"]))
+        if code is None:
+            raise ValueError(f"unknown key {step['key']!r}")
+        events = key_press_to_events(int(code)) if hid else None
+        return f"key({step['key']})", partial(idb, udid, ["ui", "key", code]), events
+    if op == "button":
+        button = str(step["button"]).upper()
+        if button not in BUTTONS:
+            raise ValueError(f"invalid button {button!r}")
+        events = button_press_to_events(HIDButtonType[button]) if hid else None
+        return f"button({button})", partial(idb, udid, ["ui", "button", button]), events
+    if op == "sleep":
+        seconds = float(step["seconds"])
+        events = [HIDDelay(duration=seconds)] if hid else None
+        return f"sleep({seconds})", partial(time.sleep, seconds), events
+    raise ValueError(f"unknown op {op!r}")
+
+
+async def _hid_stream(events: list):
+    for event in events:
+        yield event
+
+
+def cmd_script(args) -> None:
+    """
+    Run a JSON list of navigation steps as one batch: a single describe-all before
+    and after, and — over gRPC — one HID event stream for every step.
+    """
+    try:
+        with (contextlib.nullcontext(sys.stdin) if args.path == "-" else open(args.path)) as f:
+            steps = json.load(f)
+    except (OSError, ValueError) as exc:
+        print(f"ERROR: cannot read script {args.path}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if not isinstance(steps, list):
+        print("ERROR: script must be a JSON list of steps", file=sys.stderr)
+        sys.exit(1)
+
+    plan = []
+    for i, step in enumerate(steps, 1):
+        try:
+            plan.append(script_step(args.udid, step))
+        except Exception as exc:
+            print(f"ERROR: script step {i} ({step!r}): {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    def action():
+        client = get_client(args.udid)
+        if client is not None:
+            events = [e for _, _, step_events in plan for e in step_events]
+            _await(client.hid(_hid_stream(events)))
+        else:
+            for _, run_step, _ in plan:
+                run_step()
+        return "\n".join(f"  ✓ {desc}" for desc, _, _ in plan)
+
+    with_ui_hooks(args.udid, f"script({len(plan)} steps)", action, capture_pre=args.pre)
 
 
 # ---------------------------------------------------------------------------
@@ -445,23 +980,22 @@ def cmd_openurl(args) -> None:
 
 def cmd_describe(args) -> None:
     """Dump all UI elements with coordinates (describe-all)."""
-    elements = describe_all(args.udid)
-
     if args.json:
-        print(json.dumps(elements, indent=2))
+        print_json(json_loads(describe_payload(args.udid)))
         return
 
+    elements = describe_all(args.udid)
+
     print_ui_summary(elements, "Full UI Accessibility Tree")
 
     if args.verbose:
-        print("\nAll elements:")
-        for e in elements:
-            label = e.get("AXLabel") or e.get("title") or e.get("AXValue") or ""
-            role = e.get("type") or e.get("role") or "?"
+        out = ["\nAll elements:"]
+        cols = ui_columns(elements)
+        for e, label, role, (cx, cy) in zip(elements, cols.texts, cols.roles, cols.centers):
             frame = e.get("frame", {})
-            cx, cy = element_center(e)
             enabled = "enabled" if e.get("enabled", True) else "disabled"
-            print(f"  [{role:<24}] '{label}'  frame=({frame.get('x',0):.0f},{frame.get('y',0):.0f},{frame.get('width',0):.0f}×{frame.get('height',0):.0f})  center=({cx:.0f},{cy:.0f})  {enabled}")
+            out.append(f"  [{role:<24}] '{label}'  frame=({frame.get('x',0):.0f},{frame.get('y',0):.0f},{frame.get('width',0):.0f}×{frame.get('height',0):.0f})  center=({cx:.0f},{cy:.0f})  {enabled}")
+        write_lines(out)
 
 
 def cmd_find(args) -> None:
@@ -471,11 +1005,9 @@ def cmd_find(args) -> None:
     if elem is None:
         print(f"No element found for '{args.label}'")
         print("\nAvailable labels:")
-        for e in elements:
-            lbl = e.get("AXLabel") or e.get("title") or e.get("AXValue") or ""
+        cols = ui_columns(elements)
+        for lbl, role, (cx, cy) in zip(cols.texts, cols.roles, cols.centers):
             if lbl:
-                role = e.get("type") or e.get("role") or "?"
-                cx, cy = element_center(e)
                 print(f"  [{role}] '{lbl}'  center=({cx:.0f},{cy:.0f})")
         sys.exit(1)
 
@@ -493,6 +1025,23 @@ def cmd_find(args) -> None:
         print(f"          (add --udid {args.udid})")
 
 
+def cmd_find_many(args) -> None:
+    """Find several UI elements from one describe-all and print their tap coordinates."""
+    elements = describe_all(args.udid)
+    found = find_elements(elements, args.labels)
+    print()
+    for query, elem in found.items():
+        if elem is None:
+            print(f"  '{query}': not found")
+            continue
+        cx, cy = element_center(elem)
+        role = elem.get("type") or elem.get("role") or "?"
+        lbl = elem.get("AXLabel") or elem.get("title") or elem.get("AXValue") or ""
+        print(f"  '{query}': [{role}] '{lbl}'  center=({cx:.0f},{cy:.0f})  tap: idb ui tap {int(cx)} {int(cy)}")
+    if None in found.values():
+        sys.exit(1)
+
+
 def cmd_screenshot(args) -> None:
     """Take a screenshot."""
     cmd = ["idb", "screenshot", args.path] + udid_flags(args.udid)
@@ -500,28 +1049,71 @@ def cmd_screenshot(args) -> None:
     print(f"Screenshot saved: {args.path}")
 
 
+# ---------------------------------------------------------------------------
+# Daemon mode
+# ---------------------------------------------------------------------------
+
+def cmd_daemon(_args) -> None:
+    """
+    Read commands from stdin, one JSON array of CLI arguments per line
+    (e.g. ["tap", "100", "200", "--udid", "<UDID>"]), and run them in this process
+    so the idb connection pool and describe-all cache carry over between commands.
+    After each command a status line {"command": ..., "exit": <code>} is printed.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        command = None
+        try:
+            argv = json_loads(line)
+            if not (isinstance(argv, list) and argv and all(isinstance(a, str) for a in argv)):
+                raise ValueError("expected a non-empty JSON array of strings")
+            command = argv[0]
+            if argv[0] == "daemon":
+                raise ValueError("daemon cannot be nested")
+            args = build_parser(argv[0] if argv[0] in SUBPARSERS else None).parse_args(argv)
+            if args.command == "script" and args.path == "-":
+                raise ValueError("script - cannot read stdin inside the daemon; pass a file")
+            COMMANDS[args.command](args)
+            code = 0
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            code = 1
+        sys.stdout.flush()
+        print(json.dumps({"command": command, "exit": code}), flush=True)
+
+
 # ---------------------------------------------------------------------------
 # Argument parser
 # ---------------------------------------------------------------------------
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        description="iOS Simulator automation via idb + xcrun simctl",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
+def add_pre_flag(p, default: bool = True) -> None:
+    """Add --pre/--no-pre to a navigation command: whether to capture the PRE-action UI state."""
+    p.add_argument("--pre", action=argparse.BooleanOptionalAction, default=default,
+                   help=f"Capture the UI state before the action (default: {'on' if default else 'off'})")
 
-    sub = parser.add_subparsers(dest="command", required=True)
 
-    # ---- Simulator management ----
+# ---- Simulator management ----
+
+def add_list_parser(sub) -> None:
     sub.add_parser("list", help="List available simulators")
 
+
+def add_boot_parser(sub) -> None:
     p = sub.add_parser("boot", help="Boot a simulator")
     p.add_argument("udid", help="Simulator UDID")
 
+
+def add_shutdown_parser(sub) -> None:
     p = sub.add_parser("shutdown", help="Shutdown a simulator")
     p.add_argument("udid", help="Simulator UDID")
 
-    # ---- Build ----
+
+# ---- Build ----
+
+def add_build_parser(sub) -> None:
     p = sub.add_parser("build", help="Build app for simulator via xcodebuild")
     grp = p.add_mutually_exclusive_group(required=True)
     grp.add_argument("--project", "-p", help=".xcodeproj path")
@@ -531,33 +1123,56 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--derived-data", "-d", help="DerivedData path (default /tmp/ios_sim_derived)")
     p.add_argument("--udid", help="Target simulator UDID")
 
-    # ---- App management ----
+
+# ---- App management ----
+
+def add_install_parser(sub) -> None:
     p = sub.add_parser("install", help="Install .app or .ipa")
     p.add_argument("app_path", help="Path to .app bundle or .ipa")
     p.add_argument("--udid", help="Target simulator UDID")
 
+
+def add_launch_parser(sub) -> None:
     p = sub.add_parser("launch", help="Launch app by bundle ID")
     p.add_argument("bundle_id")
     p.add_argument("--udid")
 
+
+def add_launch_all_parser(sub) -> None:
+    p = sub.add_parser("launch-all", help="Launch app on several simulators in parallel")
+    p.add_argument("bundle_id")
+    p.add_argument("--udid", action="append", help="Repeat for each simulator (default: all booted)")
+
+
+def add_terminate_parser(sub) -> None:
     p = sub.add_parser("terminate", help="Terminate running app")
     p.add_argument("bundle_id")
     p.add_argument("--udid")
 
+
+def add_list_apps_parser(sub) -> None:
     p = sub.add_parser("list-apps", help="List installed apps")
     p.add_argument("--udid")
 
-    # ---- Navigation (all use describe-all hooks) ----
+
+# ---- Navigation (all use describe-all hooks) ----
+
+def add_tap_parser(sub) -> None:
     p = sub.add_parser("tap", help="Tap at x,y coordinates")
     p.add_argument("x", type=float)
     p.add_argument("y", type=float)
     p.add_argument("--duration", type=float)
+    add_pre_flag(p)
     p.add_argument("--udid")
 
+
+def add_tap_element_parser(sub) -> None:
     p = sub.add_parser("tap-element", help="Find element by label and tap its center")
     p.add_argument("label", help="AXLabel, title, or value to search for")
     p.add_argument("--udid")
 
+
+def add_swipe_parser(sub) -> None:
     p = sub.add_parser("swipe", help="Swipe from (x1,y1) to (x2,y2)")
     p.add_argument("x1", type=float)
     p.add_argument("y1", type=float)
@@ -565,46 +1180,136 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("y2", type=float)
     p.add_argument("--duration", type=float, help="Swipe duration in seconds")
     p.add_argument("--delta", type=int, help="Pixels between touch points")
+    add_pre_flag(p)
     p.add_argument("--udid")
 
+
+def add_scroll_parser(sub) -> None:
     p = sub.add_parser("scroll", help="Scroll in a direction")
-    p.add_argument("direction", choices=["up", "down", "left", "right"])
+    p.add_argument("direction", choices=list(SCROLL_VECTORS))
     p.add_argument("--distance", type=float, default=300,
                    help="Scroll distance in points (default 300)")
     p.add_argument("--speed", type=float, default=0.4,
                    help="Swipe duration in seconds (default 0.4; lower = faster)")
     p.add_argument("--udid")
 
+
+def add_text_parser(sub) -> None:
     p = sub.add_parser("text", help="Type text into focused element")
     p.add_argument("text")
+    add_pre_flag(p)
     p.add_argument("--udid")
 
+
+def add_key_parser(sub) -> None:
     p = sub.add_parser("key", help="Press a key by keycode or name (enter, backspace, tab, …)")
     p.add_argument("key")
+    add_pre_flag(p, default=False)
     p.add_argument("--udid")
 
+
+def add_button_parser(sub) -> None:
     p = sub.add_parser("button", help="Press hardware button: HOME, LOCK, SIRI, SIDE_BUTTON, APPLE_PAY")
-    p.add_argument("button")
+    p.add_argument("button", type=str.upper, choices=sorted(BUTTONS))
+    add_pre_flag(p, default=False)
     p.add_argument("--udid")
 
+
+def add_openurl_parser(sub) -> None:
     p = sub.add_parser("openurl", help="Open a URL (http/https or deep-link scheme)")
     p.add_argument("url")
+    add_pre_flag(p, default=False)
     p.add_argument("--udid")
 
-    # ---- Inspection ----
+
+def add_script_parser(sub) -> None:
+    p = sub.add_parser("script", help="Run a JSON list of tap/swipe/text/key/button/sleep steps as one batch")
+    p.add_argument("path", help="JSON file with the steps, or - for stdin")
+    add_pre_flag(p)
+    p.add_argument("--udid")
+
+
+# ---- Inspection ----
+
+def add_describe_parser(sub) -> None:
     p = sub.add_parser("describe", help="Describe all UI elements on screen")
     p.add_argument("--json", action="store_true", help="Raw JSON output")
     p.add_argument("--verbose", "-v", action="store_true", help="Show all elements")
     p.add_argument("--udid")
 
+
+def add_describe_all_sims_parser(sub) -> None:
+    p = sub.add_parser("describe-all-sims", help="Summarize the UI of several simulators in parallel")
+    p.add_argument("--udid", action="append", help="Repeat for each simulator (default: all booted)")
+
+
+def add_find_parser(sub) -> None:
     p = sub.add_parser("find", help="Find element by label and print tap coordinates")
     p.add_argument("label")
     p.add_argument("--udid")
 
+
+def add_find_many_parser(sub) -> None:
+    p = sub.add_parser("find-many", help="Find several elements by label in one describe-all")
+    p.add_argument("labels", nargs="+")
+    p.add_argument("--udid")
+
+
+def add_daemon_parser(sub) -> None:
+    sub.add_parser("daemon", help="Run newline-delimited JSON commands from stdin in one process")
+
+
+def add_screenshot_parser(sub) -> None:
     p = sub.add_parser("screenshot", help="Take a screenshot")
     p.add_argument("path", help="Output file path (.png)")
     p.add_argument("--udid")
 
+
+SUBPARSERS = {
+    "list": add_list_parser,
+    "boot": add_boot_parser,
+    "shutdown": add_shutdown_parser,
+    "build": add_build_parser,
+    "install": add_install_parser,
+    "launch": add_launch_parser,
+    "launch-all": add_launch_all_parser,
+    "terminate": add_terminate_parser,
+    "list-apps": add_list_apps_parser,
+    "tap": add_tap_parser,
+    "tap-element": add_tap_element_parser,
+    "swipe": add_swipe_parser,
+    "scroll": add_scroll_parser,
+    "text": add_text_parser,
+    "key": add_key_parser,
+    "button": add_button_parser,
+    "openurl": add_openurl_parser,
+    "script": add_script_parser,
+    "describe": add_describe_parser,
+    "describe-all-sims": add_describe_all_sims_parser,
+    "find": add_find_parser,
+    "find-many": add_find_many_parser,
+    "screenshot": add_screenshot_parser,
+    "daemon": add_daemon_parser,
+}
+
+
+@lru_cache(maxsize=None)
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI parser. With `command`, only that subcommand is wired up —
+    main() uses this so a normal invocation skips building the other subparsers.
+    """
+    parser = argparse.ArgumentParser(
+        description="iOS Simulator automation via idb + xcrun simctl",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    sub = parser.add_subparsers(dest="command", required=True)
+    if command in SUBPARSERS:
+        SUBPARSERS[command](sub)
+    else:
+        for add_parser in SUBPARSERS.values():
+            add_parser(sub)
     return parser
 
 
@@ -615,6 +1320,7 @@ COMMANDS = {
     "build": cmd_build,
     "install": cmd_install,
     "launch": cmd_launch,
+    "launch-all": cmd_launch_all,
     "terminate": cmd_terminate,
     "list-apps": cmd_list_apps,
     "tap": cmd_tap,
@@ -625,14 +1331,19 @@ COMMANDS = {
     "key": cmd_key,
     "button": cmd_button,
     "openurl": cmd_openurl,
+    "script": cmd_script,
     "describe": cmd_describe,
+    "describe-all-sims": cmd_describe_all_sims,
     "find": cmd_find,
+    "find-many": cmd_find_many,
     "screenshot": cmd_screenshot,
+    "daemon": cmd_daemon,
 }
 
 
 def main():
-    parser = build_parser()
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = build_parser(command if command in SUBPARSERS else None)
     args = parser.parse_args()
     handler = COMMANDS.get(args.command)
     if handler: